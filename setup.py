@@ -12,7 +12,7 @@ setup(
     version=version,
     packages=[name,],
     install_requires=[
-        "parts~=1.3",
+        "numpy",
         "circuit~=1.0"
     ],
     license="MIT",